@@ -1,17 +1,32 @@
-from fastapi import FastAPI, HTTPException, Body
+from fastapi import FastAPI, HTTPException, Body, Depends, Header
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field, validator
 from typing import List, Dict, Optional, Any
 import uvicorn
+import asyncio
+from contextlib import asynccontextmanager
 import json
+import queue
 import random
+import threading
+import time
+from collections import OrderedDict
+import numpy as np
 
 from q_cell import QuantumSudokuBoard, BOARD_SIZE
+from solver_nb import NUM_CELLS, build_masks, count_solutions, generate_solved_board, set_digit
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start topping up the puzzle pools when the server starts."""
+    start_puzzle_pool()
+    yield
 
 app = FastAPI(
     title="Quantum Sudoku API",
     description="Backend API for a Quantum Sudoku game that allows users to assign multiple values to cells",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Add CORS middleware to allow frontend to connect
@@ -23,87 +38,28 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-def solve_sudoku(board):
-    """
-    Solve the Sudoku board using backtracking.
-    Returns True if a solution exists, False otherwise.
-    Modifies the board in-place with a solution if one exists.
-    """
-    # Find empty cell
-    empty_cell = find_empty(board)
-    if not empty_cell:
-        return True  # Board is complete
-    
-    row, col = empty_cell
-    
-    # Try each number 1-9
-    for num in range(1, 10):
-        if is_valid_placement(board, row, col, num):
-            # Place the number
-            board[row][col] = num
-            
-            # Recursively try to solve the rest of the board
-            if solve_sudoku(board):
-                return True
-            
-            # If we get here, this number didn't work
-            # Backtrack and try another number
-            board[row][col] = 0
-    
-    # No solution found with any number
-    return False
-
-def find_empty(board):
-    """Find an empty cell (cell with value 0) in the board"""
-    for i in range(BOARD_SIZE):
-        for j in range(BOARD_SIZE):
-            if board[i][j] == 0:
-                return (i, j)
-    return None
-
-def generate_solved_board():
-    """
-    Generate a completely solved Sudoku board by starting with
-    an empty board and using the solver.
-    """
-    # Start with an empty board
-    board = [[0 for _ in range(BOARD_SIZE)] for _ in range(BOARD_SIZE)]
-    
-    # Fill in the first few cells randomly to create variety
-    # Place a few random numbers to seed the solver
-    for _ in range(5):
-        row = random.randint(0, BOARD_SIZE - 1)
-        col = random.randint(0, BOARD_SIZE - 1)
-        if board[row][col] == 0:  # Only if cell is empty
-            # Try numbers until we find a valid one
-            nums = list(range(1, 10))
-            random.shuffle(nums)
-            for num in nums:
-                if is_valid_placement(board, row, col, num):
-                    board[row][col] = num
-                    break
-    
-    # Solve the board
-    solve_sudoku(board)
-    return board
-
 # Function to generate a random Sudoku board with some filled cells
 def generate_random_sudoku(difficulty='medium'):
     """
     Generate a random initial Sudoku board with some cells already filled.
-    Ensures the board has a valid solution.
+    Ensures the board has exactly one solution. If no more cells can be removed without
+    losing uniqueness, the puzzle may keep more cells than the difficulty asks for.
     
     Args:
         difficulty (str): 'easy', 'medium', or 'hard', determines number of filled cells
         
     Returns:
-        list: 2D list representing the initial board (0 for empty cells)
+        np.ndarray: 9x9 int8 array representing the initial board (0 for empty cells)
     """
     # Generate a fully solved board
     solved_board = generate_solved_board()
     
     # Create a puzzle by removing some numbers
-    puzzle = [row[:] for row in solved_board]  # Make a deep copy
+    puzzle = solved_board.copy()
+    rows = np.zeros(BOARD_SIZE, dtype=np.int16)
+    cols = np.zeros(BOARD_SIZE, dtype=np.int16)
+    blocks = np.zeros(BOARD_SIZE, dtype=np.int16)
+    build_masks(puzzle, rows, cols, blocks)
     
     # Determine how many cells to keep based on difficulty
     if difficulty == 'easy':
@@ -113,57 +69,111 @@ def generate_random_sudoku(difficulty='medium'):
     else:  # hard
         cells_to_keep = random.randint(20, 35)
     
-    # Calculate how many cells to remove
-    cells_to_remove = 81 - cells_to_keep
-    
-    # Remove cells randomly
-    removed = 0
-    while removed < cells_to_remove:
-        row = random.randint(0, BOARD_SIZE - 1)
-        col = random.randint(0, BOARD_SIZE - 1)
+    # Remove cells in random order, together with their 180-degree symmetric partner
+    filled = NUM_CELLS
+    for idx in np.random.permutation(NUM_CELLS).tolist():
+        if filled <= cells_to_keep:
+            break
         
-        # Only remove if the cell is not already empty
-        if puzzle[row][col] != 0:
-            # Temporarily store the value
-            temp = puzzle[row][col]
-            puzzle[row][col] = 0
-            removed += 1
-            
-            # Optional: Check if puzzle still has a unique solution
-            # For simplicity, we're skipping this check, but it could be added
-            # to ensure the puzzle has a unique solution
-    
-    return puzzle
+        partner = NUM_CELLS - 1 - idx
+        if partner == idx or filled - cells_to_keep < 2:
+            group = [idx]
+        else:
+            group = [idx, partner]
+        group = [cell for cell in group if puzzle[cell] != 0]
+        if not group:
+            continue
+        
+        for cell in group:
+            set_digit(puzzle, rows, cols, blocks, cell, 0)
+        
+        # Put the digits back if the puzzle no longer has a unique solution
+        if count_solutions(puzzle, rows, cols, blocks, 2) != 1:
+            for cell in group:
+                set_digit(puzzle, rows, cols, blocks, cell, solved_board[cell])
+        else:
+            filled -= len(group)
+    
+    return puzzle.reshape(BOARD_SIZE, BOARD_SIZE)
 
-def is_valid_placement(board, row, col, val):
+# Pool of pre-generated puzzles per difficulty, so /reset does not have to wait for the generator
+DIFFICULTIES = ('easy', 'medium', 'hard')
+PUZZLE_POOL_SIZE = 32
+PUZZLE_POOL = {difficulty: queue.Queue(maxsize=PUZZLE_POOL_SIZE) for difficulty in DIFFICULTIES}
+PUZZLE_POOL_THREADS: List[threading.Thread] = []
+
+def fill_puzzle_pool(difficulty):
     """
-    Check if placing 'val' at board[row][col] would be a valid Sudoku move.
+    Keep the pool for the given difficulty topped up (runs forever in a daemon thread).
+    The Numba solver releases the GIL, so generation runs alongside the request handlers.
     """
-    # Check row
-    for c in range(BOARD_SIZE):
-        if board[row][c] == val:
-            return False
-    
-    # Check column
-    for r in range(BOARD_SIZE):
-        if board[r][col] == val:
-            return False
-    
-    # Check 3x3 block
-    block_row = (row // 3) * 3
-    block_col = (col // 3) * 3
-    for r in range(block_row, block_row + 3):
-        for c in range(block_col, block_col + 3):
-            if board[r][c] == val:
-                return False
-    
-    # All checks passed, valid placement
-    return True
+    pool = PUZZLE_POOL[difficulty]
+    while True:
+        pool.put(generate_random_sudoku(difficulty))
+
+def get_puzzle(difficulty='medium'):
+    """Take a puzzle from the pool, generating one on the spot if the pool is empty."""
+    pool = PUZZLE_POOL.get(difficulty)
+    if pool is not None:
+        try:
+            return pool.get_nowait()
+        except queue.Empty:
+            pass
+    return generate_random_sudoku(difficulty)
+
+def start_puzzle_pool():
+    """Start one filler thread per difficulty (once per process)."""
+    if PUZZLE_POOL_THREADS:
+        return
+    for level in DIFFICULTIES:
+        thread = threading.Thread(target=fill_puzzle_pool, args=(level,), daemon=True)
+        thread.start()
+        PUZZLE_POOL_THREADS.append(thread)
+
+# One board per client session, keyed by the X-Session-Id header.
+# Sessions live in this process's memory, so with several workers a client must stick to one worker.
+SESSION_TTL = 60 * 60  # Seconds of inactivity before a session's board is dropped
+MAX_SESSIONS = 10000  # Past this, the least recently seen session is dropped to make room
+sessions: Dict[str, QuantumSudokuBoard] = {}
+session_last_seen: "OrderedDict[str, float]" = OrderedDict()  # Least recently seen first
+
+# Serializes every access to the sessions and their boards between request handlers and background tasks
+board_lock = asyncio.Lock()
+
+def new_board(difficulty='medium'):
+    """Create a Quantum Sudoku board from a new random puzzle."""
+    board = QuantumSudokuBoard()
+    board.initialize_from_array(get_puzzle(difficulty))
+    return board
+
+def evict_expired_sessions(now):
+    """Drop the boards of sessions that have been inactive for longer than SESSION_TTL."""
+    while session_last_seen:
+        session_id, last_seen = next(iter(session_last_seen.items()))
+        if now - last_seen <= SESSION_TTL:
+            break
+        del sessions[session_id]
+        del session_last_seen[session_id]
+
+def store_session(session_id, board, now):
+    """Record the session's board as just used, dropping the least recently seen session if full."""
+    if session_id not in sessions and len(sessions) >= MAX_SESSIONS:
+        oldest, _ = session_last_seen.popitem(last=False)
+        del sessions[oldest]
+    sessions[session_id] = board
+    session_last_seen[session_id] = now
+    session_last_seen.move_to_end(session_id)
 
-# Store the board instance (could be replaced with a database or session-based approach)
-initial_board = generate_random_sudoku('medium')
-quantum_board = QuantumSudokuBoard()
-quantum_board.initialize_from_array(initial_board)
+async def get_session_board(x_session_id: str = Header(...)) -> QuantumSudokuBoard:
+    """Return the board of the requesting session, creating one on first use."""
+    async with board_lock:
+        now = time.monotonic()
+        evict_expired_sessions(now)
+        board = sessions.get(x_session_id)
+        if board is None:
+            board = new_board()
+        store_session(x_session_id, board, now)
+        return board
 
 class CellAssignment(BaseModel):
     """Model for cell assignment requests"""
@@ -180,57 +190,60 @@ class CellAssignment(BaseModel):
         return v
 
 @app.post("/assign", response_model=Dict[str, Any])
-async def assign_cell_values(assignment: CellAssignment):
+async def assign_cell_values(assignment: CellAssignment,
+                             quantum_board: QuantumSudokuBoard = Depends(get_session_board)):
     """
     Assign one or more candidate values to a cell.
     
     If a single value is provided, the cell will be fully collapsed.
     If multiple values are provided, the cell will be in a partial superposition.
-    The response includes the updated state of the entire board.
+    The response only includes the cells that changed ("delta", as {"i": indices, "f", "m"}).
     """
     try:
-        # Apply the user assignment
-        quantum_board.user_assign(
-            assignment.row,
-            assignment.col,
-            assignment.candidates
-        )
+        async with board_lock:
+            # Apply the user assignment
+            delta = quantum_board.user_assign_fast(
+                assignment.row,
+                assignment.col,
+                assignment.candidates
+            )
         
-        # Return the updated board state
+        # Return the changed cells
         return {
             "success": True,
             "message": f"Cell ({assignment.row}, {assignment.col}) updated with candidates {assignment.candidates}",
-            "board": quantum_board.serialize_board()
+            "delta": delta
         }
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"An error occurred: {str(e)}")
 
-@app.get("/board")
-async def get_board():
+@app.get("/board", response_model=Dict[str, List[int]])
+async def get_board(quantum_board: QuantumSudokuBoard = Depends(get_session_board)):
     """
     Get the current state of the Quantum Sudoku board.
     
-    Returns a 9x9 grid where each cell contains either a fixed value or a set of possibilities.
+    Returns the 81 cells in row-major order as {"f": fixed values, "m": candidate bitmasks}.
     """
-    return quantum_board.serialize_board()
+    async with board_lock:
+        return quantum_board.serialize_board()
 
 @app.post("/reset")
-async def reset_board(difficulty: str = 'medium'):
+async def reset_board(difficulty: str = 'medium', x_session_id: str = Header(...)):
     """
-    Reset the Quantum Sudoku board with a new random puzzle.
+    Reset the session's Quantum Sudoku board with a new random puzzle.
     
     Args:
         difficulty: 'easy', 'medium', or 'hard' - determines the number of pre-filled cells
     """
-    global quantum_board
-    global initial_board
+    # Take a new random board with the specified difficulty
+    board = new_board(difficulty)
     
-    # Generate a new random board with the specified difficulty
-    initial_board = generate_random_sudoku(difficulty)
-    quantum_board = QuantumSudokuBoard()
-    quantum_board.initialize_from_array(initial_board)
+    async with board_lock:
+        now = time.monotonic()
+        evict_expired_sessions(now)
+        store_session(x_session_id, board, now)
     
     return {
         "success": True, 
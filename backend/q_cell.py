@@ -1,32 +1,176 @@
-import copy
+from collections import deque
 from typing import List, Dict, Optional, Tuple
 
+import numpy as np
+
 # Global Constants for Standard 9x9 Sudoku (changeable for different sizes)
 BOARD_SIZE = 9
 BLOCK_SIZE = 3
 DIGITS = set(range(1, BOARD_SIZE + 1))
 
+# Candidate bitmasks use bit d for digit d; bits 1..9 set means every digit is possible
+ALL_DIGITS_MASK = sum(1 << d for d in DIGITS)
+
+# Number of set bits for every possible candidate mask, for vectorized lookups over mask arrays
+POPCOUNT = np.array([m.bit_count() for m in range(ALL_DIGITS_MASK + 1)], dtype=np.int8)
+
+
+def _compute_neighbors(row: int, col: int) -> Tuple[Tuple[int, int], ...]:
+    """
+    Compute coordinates of all cells in the same row, column, and block as (row, col)
+    excluding the cell itself.
+    """
+    neighbors = set()
+    # Row neighbors
+    for j in range(BOARD_SIZE):
+        if j != col:
+            neighbors.add((row, j))
+    # Column neighbors
+    for i in range(BOARD_SIZE):
+        if i != row:
+            neighbors.add((i, col))
+    # Block neighbors
+    block_row_start = (row // BLOCK_SIZE) * BLOCK_SIZE
+    block_col_start = (col // BLOCK_SIZE) * BLOCK_SIZE
+    for i in range(block_row_start, block_row_start + BLOCK_SIZE):
+        for j in range(block_col_start, block_col_start + BLOCK_SIZE):
+            if (i, j) != (row, col):
+                neighbors.add((i, j))
+    return tuple(sorted(neighbors))
+
+
+# Lookup tables indexed by flat cell index (row * BOARD_SIZE + col), computed once at import
+NEIGHBORS: List[Tuple[Tuple[int, int], ...]] = [
+    _compute_neighbors(r, c) for r in range(BOARD_SIZE) for c in range(BOARD_SIZE)
+]
+NEIGHBOR_ROWS = np.array([[r for r, _ in cells] for cells in NEIGHBORS], dtype=np.int8)
+NEIGHBOR_COLS = np.array([[c for _, c in cells] for cells in NEIGHBORS], dtype=np.int8)
+
+# BLOCK_OF[row, col] is the index (0-8) of the 3x3 block containing (row, col)
+BLOCK_OF = np.array(
+    [[(r // BLOCK_SIZE) * BLOCK_SIZE + c // BLOCK_SIZE for c in range(BOARD_SIZE)] for r in range(BOARD_SIZE)],
+    dtype=np.int8,
+)
+
+
+def mask_to_digits(mask: int) -> List[int]:
+    """Return the digits set in a candidate bitmask, in ascending order."""
+    digits = []
+    while mask:
+        bit = mask & -mask
+        digits.append(bit.bit_length() - 1)
+        mask ^= bit
+    return digits
+
+
+class QuantumBoardState:
+    """
+    Struct-of-arrays storage for the state of every cell on the board.
+    
+    Attributes:
+        fixed (np.ndarray): int8[9, 9] collapsed values, 0 where the cell is not collapsed.
+        masks (np.ndarray): uint16[9, 9] candidate bitmasks, where bit d is set if d is still possible.
+            A fixed cell holds only the bit of its value.
+        rows, cols, blocks (np.ndarray): uint16[9] bitmasks of the digits fixed in each row,
+            column and block. They are kept in sync by set_fixed, so a duplicate can never be placed.
+    """
+    __slots__ = ('fixed', 'masks', 'rows', 'cols', 'blocks')
+
+    def __init__(self):
+        self.fixed = np.zeros((BOARD_SIZE, BOARD_SIZE), dtype=np.int8)
+        self.masks = np.zeros((BOARD_SIZE, BOARD_SIZE), dtype=np.uint16)
+        self.rows = np.zeros(BOARD_SIZE, dtype=np.uint16)
+        self.cols = np.zeros(BOARD_SIZE, dtype=np.uint16)
+        self.blocks = np.zeros(BOARD_SIZE, dtype=np.uint16)
+
+    def copy(self) -> 'QuantumBoardState':
+        """Return an independent copy of the state."""
+        state = QuantumBoardState.__new__(QuantumBoardState)
+        for name in self.__slots__:
+            setattr(state, name, getattr(self, name).copy())
+        return state
+
+    def set_fixed(self, row: int, col: int, value: int):
+        """
+        Set the fixed value of the cell at (row, col) (0 to clear it), keeping the unit bitmasks in sync.
+        
+        Raises:
+            ValueError: If value is already fixed in the same row, column, or block
+        """
+        block = BLOCK_OF[row, col]
+        old = self.fixed[row, col]
+        if old:
+            bit = 1 << int(old)
+            self.rows[row] ^= bit
+            self.cols[col] ^= bit
+            self.blocks[block] ^= bit
+        if value:
+            bit = 1 << value
+            if (self.rows[row] | self.cols[col] | self.blocks[block]) & bit:
+                if old:
+                    self.set_fixed(row, col, int(old))
+                raise ValueError(f"Cannot place {value} at ({row}, {col}): it is already fixed in the same row, column or block")
+            self.rows[row] |= bit
+            self.cols[col] |= bit
+            self.blocks[block] |= bit
+        self.fixed[row, col] = value
+
 
 class SudokuCell:
     """
     Represents an individual cell on the Quantum Sudoku board.
     
+    The cell is a view into the board's QuantumBoardState: reads and writes go
+    straight through to the state arrays.
+    
     Attributes:
         fixed_value (Optional[int]): The collapsed value if the cell has been set to a single number.
-        possibilities (Dict[int, float]): A mapping of candidate numbers to their probability weights.
-            For a cell in a full superposition state, this dict holds all possible numbers (per sudoku rules)
-            with equal probabilities. A "partial collapse" is represented by a reduced dictionary.
+        mask (int): Bitmask of candidate numbers, where bit d is set if d is still possible.
+            For a cell in a full superposition state, this holds all possible numbers (per sudoku rules).
+            A "partial collapse" is represented by a reduced mask.
+        count (int): Number of candidates in the mask. Every candidate has probability 1/count.
     """
-    def __init__(self, fixed_value: Optional[int] = None):
-        self.fixed_value = fixed_value
-        
-        # If the cell is not fixed, it starts with an empty possibility set.
-        # This will be initialized later with valid candidates.
-        self.possibilities: Dict[int, float] = {}
+    __slots__ = ('state', 'row', 'col')
+
+    def __init__(self, state: QuantumBoardState, row: int, col: int):
+        self.state = state
+        self.row = row
+        self.col = col
+
+    @property
+    def fixed_value(self) -> Optional[int]:
+        value = self.state.fixed[self.row, self.col]
+        return int(value) if value else None
+
+    @fixed_value.setter
+    def fixed_value(self, value: Optional[int]):
+        self.state.set_fixed(self.row, self.col, value or 0)
+
+    @property
+    def mask(self) -> int:
+        return int(self.state.masks[self.row, self.col])
+
+    @mask.setter
+    def mask(self, value: int):
+        self.state.masks[self.row, self.col] = value
+
+    @property
+    def count(self) -> int:
+        return self.mask.bit_count()
+
+    @property
+    def possibilities(self) -> Dict[int, float]:
+        """A mapping of candidate numbers to their (equal) probability weights."""
+        count = self.count
+        return {num: 1.0 / count for num in self.candidates()}
+
+    def candidates(self) -> List[int]:
+        """Return the candidate numbers in ascending order."""
+        return mask_to_digits(self.mask)
 
     def is_collapsed(self) -> bool:
         """Return True if the cell is fully collapsed (only one possibility/fixed)."""
-        return self.fixed_value is not None or len(self.possibilities) == 1
+        return self.fixed_value is not None or self.count == 1
 
     def collapse(self, number: int):
         """
@@ -35,7 +179,7 @@ class SudokuCell:
         Sets the fixed_value to the provided number and resets possibilities to that number only.
         """
         self.fixed_value = number
-        self.possibilities = {number: 1.0}
+        self.mask = 1 << number
 
     def update_possibilities(self, candidates: List[int]):
         """
@@ -45,25 +189,22 @@ class SudokuCell:
         """
         if not candidates:
             raise ValueError("Candidate list cannot be empty.")
-        probability = 1.0 / len(candidates)
         self.fixed_value = None  # clear any previous fixed assignment
-        self.possibilities = {num: probability for num in candidates}
+        self.mask = sum(1 << num for num in set(candidates))
 
     def remove_candidate(self, candidate: int):
         """
-        Remove a candidate from the possibility set (if present) and re-normalize probabilities.
+        Remove a candidate from the possibility set (if present).
         If the removal reduces the possibility list to a single candidate, collapse the cell.
         """
-        if candidate in self.possibilities:
-            del self.possibilities[candidate]
-            if len(self.possibilities) == 1:
+        bit = 1 << candidate
+        mask = self.mask
+        if mask & bit:
+            mask ^= bit
+            self.mask = mask
+            if mask.bit_count() == 1:
                 # Auto-collapse if there is only one possibility remaining.
-                remaining_number = next(iter(self.possibilities))
-                self.collapse(remaining_number)
-            else:
-                # Recalculate equal probabilities
-                n = len(self.possibilities)
-                self.possibilities = {num: 1.0 / n for num in self.possibilities}
+                self.collapse((mask & -mask).bit_length() - 1)
 
     def __repr__(self):
         if self.fixed_value is not None:
@@ -78,13 +219,17 @@ class QuantumSudokuBoard:
     Methods include board initialization, handling user inputs (single or multi-value),
     constraint propagation across rows, columns, and blocks, and serialization of board state.
     """
+    __slots__ = ('state',)
+
     def __init__(self):
-        # Create a 9x9 grid of cells
-        self.board: List[List[SudokuCell]] = [
-            [SudokuCell() for _ in range(BOARD_SIZE)] for _ in range(BOARD_SIZE)
-        ]
+        # Create the (empty) 9x9 board state
+        self.state = QuantumBoardState()
         self.initialize_board()
 
+    def cell(self, row: int, col: int) -> SudokuCell:
+        """Return a view of the cell at (row, col)."""
+        return SudokuCell(self.state, row, col)
+
     def initialize_from_array(self, initial_board: List[List[int]]):
         """
         Initialize the board from a 2D array representation.
@@ -92,23 +237,15 @@ class QuantumSudokuBoard:
         Args:
             initial_board: A 9x9 array where 0 represents empty cells and 1-9 are initial values
         """
-        # First create the cells with fixed values
-        self.board = []
-        for i in range(BOARD_SIZE):
-            row = []
-            for j in range(BOARD_SIZE):
-                value = initial_board[i][j]
-                if value != 0:
-                    # Create a cell with a fixed value
-                    cell = SudokuCell(fixed_value=value)
-                else:
-                    # Create an empty cell
-                    cell = SudokuCell()
-                row.append(cell)
-            self.board.append(row)
+        # First set the fixed values
+        self.state = QuantumBoardState()
+        self.state.fixed[:] = np.asarray(initial_board, dtype=np.int8)
         
         # Then initialize possibilities for the empty cells
         self.initialize_board()
+        
+        # From here on, the invariants are maintained on every write
+        self.validate_board_consistency()
 
     def initialize_board(self):
         """
@@ -116,54 +253,54 @@ class QuantumSudokuBoard:
         
         For each cell that does not have a fixed value (or given initial puzzle value),
         assign the full set of valid digits as possibilities with equal probability.
-        Here we assume an empty board: you could adapt this to an initial puzzle by setting
-        fixed values before calling this method.
+        Fixed cells get the single bit of their value.
         """
-        for i in range(BOARD_SIZE):
-            for j in range(BOARD_SIZE):
-                cell = self.board[i][j]
-                if cell.fixed_value is None:
-                    valid_candidates = self.get_valid_candidates(i, j)
-                    if valid_candidates:
-                        probability = 1.0 / len(valid_candidates)
-                        cell.possibilities = {num: probability for num in valid_candidates}
+        state = self.state
+        bits = (1 << state.fixed.astype(np.uint16)) & ALL_DIGITS_MASK
+        
+        # Digits used in every row, column and block
+        state.rows = np.bitwise_or.reduce(bits, axis=1)
+        state.cols = np.bitwise_or.reduce(bits, axis=0)
+        state.blocks = np.bitwise_or.reduce(
+            bits.reshape(BLOCK_SIZE, BLOCK_SIZE, BLOCK_SIZE, BLOCK_SIZE), axis=(1, 3)
+        ).ravel()
+        
+        used = state.rows[:, None] | state.cols[None, :] | state.blocks[BLOCK_OF]
+        state.masks = np.where(state.fixed > 0, bits, ALL_DIGITS_MASK & ~used).astype(np.uint16)
+
+    def get_candidate_mask(self, row: int, col: int) -> int:
+        """
+        Get the bitmask of valid candidates for the cell at position (row, col)
+        by excluding digits already fixed in the same row, column, or block.
+        """
+        state = self.state
+        used = int(state.rows[row] | state.cols[col] | state.blocks[BLOCK_OF[row, col]])
+        return ALL_DIGITS_MASK & ~used
 
     def get_valid_candidates(self, row: int, col: int) -> List[int]:
         """
         Get valid candidates for the cell at position (row, col)
         by excluding digits already fixed in the same row, column, or block.
         """
-        used = set()
-
-        # Get numbers in the same row
-        used.update(self.get_row_values(row))
-        # Get numbers in the same column
-        used.update(self.get_column_values(col))
-        # Get numbers in the same block
-        used.update(self.get_block_values(row, col))
-        
-        # Exclude the already used numbers
-        valid = list(DIGITS - used)
-        return valid
+        return mask_to_digits(self.get_candidate_mask(row, col))
 
     def get_row_values(self, row: int) -> set:
         """Return all fixed values in a given row."""
-        return {cell.fixed_value for cell in self.board[row] if cell.fixed_value is not None}
+        values = self.state.fixed[row]
+        return set(values[values > 0].tolist())
 
     def get_column_values(self, col: int) -> set:
         """Return all fixed values in a given column."""
-        return {self.board[i][col].fixed_value for i in range(BOARD_SIZE) if self.board[i][col].fixed_value is not None}
+        values = self.state.fixed[:, col]
+        return set(values[values > 0].tolist())
 
     def get_block_values(self, row: int, col: int) -> set:
         """Return all fixed values in the block containing the cell (row, col)."""
         block_row_start = (row // BLOCK_SIZE) * BLOCK_SIZE
         block_col_start = (col // BLOCK_SIZE) * BLOCK_SIZE
-        values = set()
-        for i in range(block_row_start, block_row_start + BLOCK_SIZE):
-            for j in range(block_col_start, block_col_start + BLOCK_SIZE):
-                if self.board[i][j].fixed_value is not None:
-                    values.add(self.board[i][j].fixed_value)
-        return values
+        values = self.state.fixed[block_row_start:block_row_start + BLOCK_SIZE,
+                                  block_col_start:block_col_start + BLOCK_SIZE]
+        return set(values[values > 0].tolist())
 
     def user_assign(self, row: int, col: int, candidates: List[int]):
         """
@@ -173,25 +310,56 @@ class QuantumSudokuBoard:
         If multiple numbers are provided, update the cell's superposition state accordingly.
         Before updating, ensure that the candidates are valid (i.e. they appear in the cell's current possibilities).
         After the update, propagate constraints to all affected cells.
+        
+        Every write checks the Sudoku rules incrementally, so no full-board scan is needed.
+        If the move (or a collapse it triggers) breaks a rule, the board is left unchanged.
+        
+        Raises:
+            ValueError: If the move is invalid or leads to an invalid Sudoku state
         """
-        cell = self.board[row][col]
+        cell = self.cell(row, col)
         
         # Check if the cell is already fixed
         if cell.fixed_value is not None:
             raise ValueError(f"Cannot modify cell ({row}, {col}) as it is already fixed to {cell.fixed_value}")
             
-        current_possibilities = set(cell.possibilities.keys())
-        if not set(candidates).issubset(current_possibilities):
+        requested = 0
+        for candidate in candidates:
+            requested |= 1 << candidate
+        if requested & ~cell.mask:
             raise ValueError(f"User input error: the candidates {candidates} are not all valid for cell ({row}, {col}).")
         
-        # Update the cell based on user selection
-        if len(candidates) == 1:
-            cell.collapse(candidates[0])
-        else:
-            cell.update_possibilities(candidates)
+        snapshot = self.state.copy()
+        try:
+            # Update the cell based on user selection
+            if len(candidates) == 1:
+                cell.collapse(candidates[0])
+            else:
+                cell.update_possibilities(candidates)
+            
+            # Propagate updated constraints to all cells that share the same row, column, and block
+            self.propagate_constraints(row, col, candidates)
+        except ValueError:
+            self.state = snapshot
+            raise
+
+    def user_assign_fast(self, row: int, col: int, candidates: List[int]) -> dict:
+        """
+        Process user input like user_assign, and return only what changed.
+        
+        Returns the delta of the move in the serialize_board schema: the flat indices "i"
+        of every cell that changed, with their fixed values "f" and candidate masks "m".
+        """
+        old_fixed = self.state.fixed.copy()
+        old_masks = self.state.masks.copy()
+        self.user_assign(row, col, candidates)
         
-        # Propagate updated constraints to all cells that share the same row, column, and block
-        self.propagate_constraints(row, col, candidates)
+        changed = np.flatnonzero((self.state.fixed != old_fixed) | (self.state.masks != old_masks))
+        return {
+            "i": changed.tolist(),
+            "f": self.state.fixed.ravel()[changed].tolist(),
+            "m": self.state.masks.ravel()[changed].tolist(),
+        }
 
     def propagate_constraints(self, row: int, col: int, assigned_candidates: List[int]):
         """
@@ -205,59 +373,67 @@ class QuantumSudokuBoard:
         For simplicity, this implementation uses the exclusive constraint:
           For any neighboring cell (that is not collapsed), remove any candidate that appears in assigned_candidates.
         
-        After removal, if a neighboring cell has only one possibility left, automatically collapse it.
-        """
-        # If single value (collapsed cell), enforce strict Sudoku rules
-        if len(assigned_candidates) == 1:
-            candidate = assigned_candidates[0]
-            neighbors = self.get_neighbors(row, col)
-            for n_row, n_col in neighbors:
-                neighbor_cell = self.board[n_row][n_col]
-                # Skip already collapsed cells
-                if neighbor_cell.fixed_value is not None:
-                    continue
-                
-                # Remove this candidate from neighbor's possibilities
-                neighbor_cell.remove_candidate(candidate)
-        else:
-            # For multi-value assignments, use probabilistic constraints
-            neighbors = self.get_neighbors(row, col)
-            for n_row, n_col in neighbors:
-                neighbor_cell = self.board[n_row][n_col]
-                # If neighbor is collapsed, skip updating
-                if neighbor_cell.is_collapsed():
-                    continue
-                
-                # Remove each assigned candidate from the neighbor possibilities
-                # This implements exclusive constraint strategy
-                for candidate in assigned_candidates:
-                    neighbor_cell.remove_candidate(candidate)
+        After removal, if a neighboring cell has only one possibility left, automatically collapse it
+        and propagate its value in turn.
         
-        # Add additional validation to ensure no invalid Sudoku state
-        self.validate_board_consistency()
+        Raises:
+            ValueError: If a neighbor is left without candidates, or a collapse duplicates a fixed value
+        """
+        clear = 0
+        for candidate in assigned_candidates:
+            clear |= 1 << candidate
+        
+        # If single value (collapsed cell), enforce strict Sudoku rules: only fixed neighbors are skipped.
+        # For multi-value assignments, neighbors with a single possibility left are skipped as well.
+        self._eliminate(row, col, clear, skip_singletons=len(assigned_candidates) > 1)
 
-    def get_neighbors(self, row: int, col: int) -> List[Tuple[int, int]]:
+    def _eliminate(self, row: int, col: int, clear: int, skip_singletons: bool = False):
+        """
+        Remove the digits in the 'clear' bitmask from every non-collapsed neighbor of (row, col)
+        in a single vectorized update, then collapse any neighbor left with one candidate.
+        
+        Collapsed neighbors are queued and their values propagated breadth-first (AC-3 style),
+        so a cascade is processed in one sweep rather than by recursion.
+        """
+        state = self.state
+        pending = deque([(row, col, clear, skip_singletons)])
+        while pending:
+            row, col, clear, skip_singletons = pending.popleft()
+            idx = row * BOARD_SIZE + col
+            n_rows = NEIGHBOR_ROWS[idx]
+            n_cols = NEIGHBOR_COLS[idx]
+            
+            # Skip already collapsed neighbors
+            old = state.masks[n_rows, n_cols]
+            active = state.fixed[n_rows, n_cols] == 0
+            if skip_singletons:
+                active &= POPCOUNT[old] != 1
+            n_rows = n_rows[active]
+            n_cols = n_cols[active]
+            old = old[active]
+            
+            new = old & (ALL_DIGITS_MASK & ~clear)
+            state.masks[n_rows, n_cols] = new
+            
+            # Ensure no neighbor lost its last candidate
+            stuck = np.flatnonzero((new == 0) & (old != 0))
+            if len(stuck):
+                i, j = n_rows[stuck[0]], n_cols[stuck[0]]
+                raise ValueError(f"Cell at ({i},{j}) has no valid candidates, making the puzzle unsolvable")
+            
+            # Auto-collapse neighbors whose possibilities were reduced to a single candidate
+            singletons = (new != old) & (POPCOUNT[new] == 1)
+            for n_row, n_col, bit in zip(n_rows[singletons].tolist(), n_cols[singletons].tolist(),
+                                         new[singletons].tolist()):
+                state.set_fixed(n_row, n_col, bit.bit_length() - 1)
+                pending.append((n_row, n_col, bit, False))
+
+    def get_neighbors(self, row: int, col: int) -> Tuple[Tuple[int, int], ...]:
         """
         Get coordinates of all cells in the same row, column, and block as (row, col)
         excluding the cell itself.
         """
-        neighbors = set()
-        # Row neighbors
-        for j in range(BOARD_SIZE):
-            if j != col:
-                neighbors.add((row, j))
-        # Column neighbors
-        for i in range(BOARD_SIZE):
-            if i != row:
-                neighbors.add((i, col))
-        # Block neighbors
-        block_row_start = (row // BLOCK_SIZE) * BLOCK_SIZE
-        block_col_start = (col // BLOCK_SIZE) * BLOCK_SIZE
-        for i in range(block_row_start, block_row_start + BLOCK_SIZE):
-            for j in range(block_col_start, block_col_start + BLOCK_SIZE):
-                if (i, j) != (row, col):
-                    neighbors.add((i, j))
-        return list(neighbors)
+        return NEIGHBORS[row * BOARD_SIZE + col]
 
     def validate_board_consistency(self):
         """
@@ -265,64 +441,51 @@ class QuantumSudokuBoard:
         Ensures that fixed/collapsed cells maintain valid Sudoku constraints across
         rows, columns, and blocks.
         
+        Moves are checked incrementally as they are applied, so this full scan is only
+        run when a board is initialized.
+        
         Raises:
             ValueError: If any Sudoku rule is violated (duplicate values in row/column/block)
         """
+        fixed = self.state.fixed
+        
         # Check all rows for duplicates
         for i in range(BOARD_SIZE):
             row_values = self.get_row_values(i)
-            if len(row_values) < len([cell for cell in self.board[i] if cell.fixed_value is not None]):
+            if len(row_values) < np.count_nonzero(fixed[i]):
                 raise ValueError(f"Row {i} contains duplicate fixed values: {row_values}")
                 
         # Check all columns for duplicates
         for j in range(BOARD_SIZE):
             col_values = self.get_column_values(j)
-            fixed_in_col = sum(1 for i in range(BOARD_SIZE) if self.board[i][j].fixed_value is not None)
-            if len(col_values) < fixed_in_col:
+            if len(col_values) < np.count_nonzero(fixed[:, j]):
                 raise ValueError(f"Column {j} contains duplicate fixed values: {col_values}")
                 
         # Check all 3x3 blocks for duplicates
         for block_row in range(0, BOARD_SIZE, BLOCK_SIZE):
             for block_col in range(0, BOARD_SIZE, BLOCK_SIZE):
-                # Get all fixed values in this block
-                block_values = set()
-                fixed_count = 0
-                for i in range(block_row, block_row + BLOCK_SIZE):
-                    for j in range(block_col, block_col + BLOCK_SIZE):
-                        if self.board[i][j].fixed_value is not None:
-                            block_values.add(self.board[i][j].fixed_value)
-                            fixed_count += 1
-                
+                block_values = self.get_block_values(block_row, block_col)
+                fixed_count = np.count_nonzero(fixed[block_row:block_row + BLOCK_SIZE,
+                                                     block_col:block_col + BLOCK_SIZE])
                 if len(block_values) < fixed_count:
                     raise ValueError(f"Block at ({block_row},{block_col}) contains duplicate fixed values: {block_values}")
         
         # Check for cells with no remaining valid candidates
-        for i in range(BOARD_SIZE):
-            for j in range(BOARD_SIZE):
-                cell = self.board[i][j]
-                if cell.fixed_value is None and not cell.possibilities:
-                    raise ValueError(f"Cell at ({i},{j}) has no valid candidates, making the puzzle unsolvable")
+        stuck = np.argwhere((fixed == 0) & (self.state.masks == 0))
+        if len(stuck):
+            i, j = stuck[0]
+            raise ValueError(f"Cell at ({i},{j}) has no valid candidates, making the puzzle unsolvable")
 
-    def serialize_board(self) -> List[List[dict]]:
+    def serialize_board(self) -> Dict[str, List[int]]:
         """
         Prepare the board state for transmission to a client.
         
-        For each cell, if it has a fixed value, return that value.
-        Otherwise, return the list of candidates with corresponding probability percentages.
+        Returns the 81 cells in row-major order as two flat lists: "f" holds the fixed
+        value of each cell (0 if not collapsed) and "m" its candidate bitmask. Every
+        candidate of a cell has probability 100 / popcount(mask) percent; the client
+        derives the percentages.
         """
-        serialized = []
-        for i in range(BOARD_SIZE):
-            row_serial = []
-            for j in range(BOARD_SIZE):
-                cell = self.board[i][j]
-                if cell.fixed_value is not None:
-                    row_serial.append({"value": cell.fixed_value})
-                else:
-                    # Display probabilities as percentages rounded to 2 decimals.
-                    probs = {num: round(prob * 100, 2) for num, prob in cell.possibilities.items()}
-                    row_serial.append({"possibilities": probs})
-            serialized.append(row_serial)
-        return serialized
+        return {"f": self.state.fixed.ravel().tolist(), "m": self.state.masks.ravel().tolist()}
 
     def print_board(self):
         """
@@ -332,12 +495,12 @@ class QuantumSudokuBoard:
         for i in range(BOARD_SIZE):
             row_str = []
             for j in range(BOARD_SIZE):
-                cell = self.board[i][j]
+                cell = self.cell(i, j)
                 if cell.fixed_value is not None:
                     row_str.append(str(cell.fixed_value))
                 else:
                     # Show the candidates (without probabilities) for brevity.
-                    row_str.append("{" + ",".join(str(num) for num in sorted(cell.possibilities)) + "}")
+                    row_str.append("{" + ",".join(str(num) for num in cell.candidates()) + "}")
             print(" ".join(row_str))
         print("\n")
 
@@ -360,7 +523,7 @@ def simulate_game_scenario():
 
     # Example: User assigns a multi-value candidate to cell (0,0)
     # (Assumes (0,0) was originally in full superposition; valid candidates derived from sudoku rules.)
-    cell_candidates = list(board.board[0][0].possibilities.keys())
+    cell_candidates = board.cell(0, 0).candidates()
     if len(cell_candidates) >= 2:
         # For example, choose two candidates from the available ones (simulate uncertainty)
         selected_candidates = cell_candidates[:2]
@@ -372,7 +535,7 @@ def simulate_game_scenario():
     board.print_board()
 
     # Further simulation: Suppose later the user collapses cell (4,4) to a single value.
-    valid_at_4_4 = list(board.board[4][4].possibilities.keys())
+    valid_at_4_4 = board.cell(4, 4).candidates()
     if valid_at_4_4:
         chosen_number = valid_at_4_4[0]
         print(f"User collapses cell (4,4) to {chosen_number}")
@@ -382,8 +545,7 @@ def simulate_game_scenario():
     # Show serialized board state
     serialized = board.serialize_board()
     print("Serialized board state:")
-    for row in serialized:
-        print(row)
+    print(serialized)
 
 
 if __name__ == "__main__":
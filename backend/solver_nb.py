@@ -0,0 +1,203 @@
+"""
+Numba-compiled Sudoku solver used to generate new puzzles.
+
+The board is a flat np.int8 array of 81 cells (0 for empty cells), and the
+row/column/block occupancy is kept in three np.int16 arrays of 9 bitmasks,
+where bit d is set when digit d is already used in that unit.
+"""
+import numpy as np
+from numba import njit
+
+from q_cell import BOARD_SIZE, ALL_DIGITS_MASK, BLOCK_OF, POPCOUNT
+
+NUM_CELLS = BOARD_SIZE * BOARD_SIZE
+
+# Number of randomly placed digits used to seed the solver
+SEED_CELLS = 5
+
+
+def _nth_set_bit_table():
+    """NTH_SET_BIT[mask, k] is the digit of the k-th lowest set bit of a candidate mask."""
+    table = np.zeros((ALL_DIGITS_MASK + 1, BOARD_SIZE), dtype=np.int8)
+    for mask in range(ALL_DIGITS_MASK + 1):
+        k = 0
+        for digit in range(1, BOARD_SIZE + 1):
+            if mask >> digit & 1:
+                table[mask, k] = digit
+                k += 1
+    return table
+
+
+NTH_SET_BIT = _nth_set_bit_table()
+
+
+@njit(cache=True)
+def build_masks(grid, rows, cols, blocks):
+    """Fill the row, column and block occupancy bitmasks from the digits on the grid."""
+    for idx in range(NUM_CELLS):
+        val = grid[idx]
+        if val != 0:
+            row = idx // BOARD_SIZE
+            col = idx % BOARD_SIZE
+            bit = 1 << val
+            rows[row] |= bit
+            cols[col] |= bit
+            blocks[BLOCK_OF[row, col]] |= bit
+
+
+@njit(cache=True)
+def set_digit(grid, rows, cols, blocks, idx, num):
+    """Set cell 'idx' to 'num' (0 to clear it), keeping the occupancy bitmasks in sync."""
+    row = idx // BOARD_SIZE
+    col = idx % BOARD_SIZE
+    block = BLOCK_OF[row, col]
+    old = grid[idx]
+    if old != 0:
+        bit = 1 << old
+        rows[row] ^= bit
+        cols[col] ^= bit
+        blocks[block] ^= bit
+    if num != 0:
+        bit = 1 << num
+        rows[row] |= bit
+        cols[col] |= bit
+        blocks[block] |= bit
+    grid[idx] = num
+
+
+@njit(cache=True)
+def find_empty(grid, rows, cols, blocks):
+    """
+    Find the empty cell with the fewest remaining candidates (minimum remaining values).
+    Returns (cell_index, candidate_mask), with cell_index -1 if the board is full.
+    A cell with zero candidates is returned immediately so the caller can backtrack.
+    """
+    best_idx = -1
+    best_avail = 0
+    best_count = 10
+    for idx in range(NUM_CELLS):
+        if grid[idx] == 0:
+            row = idx // BOARD_SIZE
+            col = idx % BOARD_SIZE
+            avail = ALL_DIGITS_MASK & ~(rows[row] | cols[col] | blocks[BLOCK_OF[row, col]])
+            count = POPCOUNT[avail]
+            if count < best_count:
+                best_idx = idx
+                best_avail = avail
+                best_count = count
+                if count <= 1:
+                    # Dead end or forced move, no need to look further
+                    break
+    return best_idx, best_avail
+
+
+@njit(cache=True, nogil=True)
+def _search(grid, rows, cols, blocks, limit, restore):
+    """
+    Backtracking search shared by solve and count_solutions.
+    Returns the number of solutions found, stopping once 'limit' have been found.
+
+    Uses an explicit stack of (cell, remaining_candidates) frames instead of recursion.
+    With 'restore' the grid and bitmasks are left unchanged; otherwise the last
+    solution found stays on the grid.
+    """
+    stack_idx = np.empty(NUM_CELLS, dtype=np.int64)
+    stack_avail = np.empty(NUM_CELLS, dtype=np.int64)
+
+    # Pick the most constrained empty cell
+    idx, avail = find_empty(grid, rows, cols, blocks)
+    if idx < 0:
+        return 1  # Board is already complete
+
+    count = 0
+    depth = 0
+    stack_idx[0] = idx
+    stack_avail[0] = avail
+    while depth >= 0:
+        idx = stack_idx[depth]
+        avail = stack_avail[depth]
+
+        # Undo the previous attempt at this cell, if any
+        if grid[idx] != 0:
+            set_digit(grid, rows, cols, blocks, idx, 0)
+
+        # No candidates left here, backtrack to the previous cell
+        if avail == 0:
+            depth -= 1
+            continue
+
+        # Place the lowest remaining candidate
+        num = 1
+        while (avail >> num) & 1 == 0:
+            num += 1
+        stack_avail[depth] = avail ^ (1 << num)
+        set_digit(grid, rows, cols, blocks, idx, num)
+
+        idx, avail = find_empty(grid, rows, cols, blocks)
+        if idx < 0:
+            count += 1
+            if count >= limit:
+                break
+            continue  # Keep searching from the last placed cell
+        depth += 1
+        stack_idx[depth] = idx
+        stack_avail[depth] = avail
+
+    # Take back every digit still placed by the search
+    if restore:
+        while depth >= 0:
+            set_digit(grid, rows, cols, blocks, stack_idx[depth], 0)
+            depth -= 1
+
+    return count
+
+
+@njit(cache=True, nogil=True)
+def solve(grid, rows, cols, blocks):
+    """
+    Solve the board in-place using backtracking.
+    Returns True if a solution exists, False otherwise.
+    """
+    return _search(grid, rows, cols, blocks, 1, False) == 1
+
+
+@njit(cache=True, nogil=True)
+def count_solutions(grid, rows, cols, blocks, limit=2):
+    """
+    Count the solutions of the board, stopping once 'limit' solutions have been found.
+    The grid and bitmasks are left unchanged.
+    """
+    return _search(grid, rows, cols, blocks, limit, True)
+
+
+@njit(cache=True, nogil=True)
+def generate_solved_board():
+    """
+    Generate a completely solved Sudoku board by starting with
+    an empty board and using the solver.
+    Returns the board as a flat np.int8 array of 81 cells.
+    """
+    # Start with an empty board
+    grid = np.zeros(NUM_CELLS, dtype=np.int8)
+    rows = np.zeros(BOARD_SIZE, dtype=np.int16)
+    cols = np.zeros(BOARD_SIZE, dtype=np.int16)
+    blocks = np.zeros(BOARD_SIZE, dtype=np.int16)
+
+    # Place a few random numbers in distinct cells to seed the solver
+    for idx in np.random.choice(NUM_CELLS, SEED_CELLS, replace=False):
+        row = idx // BOARD_SIZE
+        col = idx % BOARD_SIZE
+        block = BLOCK_OF[row, col]
+        avail = ALL_DIGITS_MASK & ~(rows[row] | cols[col] | blocks[block])
+        if avail:
+            # Pick one of the legal digits uniformly at random
+            num = NTH_SET_BIT[avail, np.random.randint(0, POPCOUNT[avail])]
+            bit = 1 << num
+            rows[row] |= bit
+            cols[col] |= bit
+            blocks[block] |= bit
+            grid[idx] = num
+
+    # Solve the board
+    solve(grid, rows, cols, blocks)
+    return grid
@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from api import generate_random_sudoku
+from q_cell import BOARD_SIZE, QuantumSudokuBoard, mask_to_digits
+
+
+def board_from_rows(rows):
+    """Build a board from a few {row index: row values} entries, every other row empty."""
+    grid = np.zeros((BOARD_SIZE, BOARD_SIZE), dtype=np.int8)
+    for i, values in rows.items():
+        grid[i] = values
+    board = QuantumSudokuBoard()
+    board.initialize_from_array(grid)
+    return board
+
+
+def state_arrays(board):
+    state = board.state
+    return [array.copy() for array in (state.fixed, state.masks, state.rows, state.cols, state.blocks)]
+
+
+def test_move_that_empties_a_neighbor_leaves_the_state_unchanged():
+    # (0, 8) can only be 9, so placing 9 at (1, 8) leaves it without candidates
+    board = board_from_rows({0: [1, 2, 3, 4, 5, 6, 7, 8, 0]})
+    assert board.cell(0, 8).candidates() == [9]
+    before = state_arrays(board)
+
+    with pytest.raises(ValueError):
+        board.user_assign(1, 8, [9])
+
+    for old, new in zip(before, state_arrays(board)):
+        assert old.dtype == new.dtype
+        assert old.tobytes() == new.tobytes()
+
+
+def test_collapse_cascades_through_a_chain_of_neighbors():
+    board = board_from_rows({
+        0: [0, 0, 3, 4, 5, 6, 7, 8, 9],
+        8: [0, 0, 9, 1, 3, 4, 5, 7, 8],
+    })
+    assert board.cell(0, 1).candidates() == [1, 2]
+    assert board.cell(8, 1).candidates() == [2, 6]
+
+    # (0, 1) collapses to 2, which collapses (8, 1) to 6, which collapses (8, 0) to 2
+    board.user_assign(0, 0, [1])
+
+    assert board.cell(0, 1).fixed_value == 2
+    assert board.cell(8, 1).fixed_value == 6
+    assert board.cell(8, 0).fixed_value == 2
+    board.validate_board_consistency()
+
+
+def test_delta_lists_exactly_the_changed_cells():
+    rng = np.random.default_rng(0)
+    board = QuantumSudokuBoard()
+    board.initialize_from_array(generate_random_sudoku('hard'))
+
+    for _ in range(30):
+        empty = np.flatnonzero(board.state.fixed.ravel() == 0)
+        if not len(empty):
+            break
+        idx = int(rng.choice(empty))
+        row, col = divmod(idx, BOARD_SIZE)
+        digits = mask_to_digits(board.cell(row, col).mask)
+        candidates = rng.choice(digits, size=rng.integers(1, len(digits) + 1), replace=False).tolist()
+
+        before = board.serialize_board()
+        try:
+            delta = board.user_assign_fast(row, col, candidates)
+        except ValueError:
+            assert board.serialize_board() == before
+            continue
+        after = board.serialize_board()
+
+        changed = [i for i in range(BOARD_SIZE * BOARD_SIZE)
+                   if (before["f"][i], before["m"][i]) != (after["f"][i], after["m"][i])]
+        assert delta["i"] == changed
+        assert delta["f"] == [after["f"][i] for i in changed]
+        assert delta["m"] == [after["m"][i] for i in changed]
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from api import generate_random_sudoku
+from q_cell import BOARD_SIZE
+from solver_nb import build_masks, count_solutions, solve
+
+
+def unit_masks(grid):
+    rows = np.zeros(BOARD_SIZE, dtype=np.int16)
+    cols = np.zeros(BOARD_SIZE, dtype=np.int16)
+    blocks = np.zeros(BOARD_SIZE, dtype=np.int16)
+    build_masks(grid, rows, cols, blocks)
+    return rows, cols, blocks
+
+
+@pytest.mark.parametrize("difficulty", ["easy", "medium", "hard"])
+def test_generated_puzzles_have_a_unique_solution(difficulty):
+    for _ in range(5):
+        grid = generate_random_sudoku(difficulty).ravel().copy()
+        rows, cols, blocks = unit_masks(grid)
+        before = [array.copy() for array in (grid, rows, cols, blocks)]
+
+        assert count_solutions(grid, rows, cols, blocks, 2) == 1
+        # Counting must leave the puzzle as it found it
+        for old, new in zip(before, (grid, rows, cols, blocks)):
+            assert np.array_equal(old, new)
+
+        assert solve(grid, rows, cols, blocks)
+        board = grid.reshape(BOARD_SIZE, BOARD_SIZE)
+        digits = list(range(1, BOARD_SIZE + 1))
+        for i in range(BOARD_SIZE):
+            assert sorted(board[i]) == digits
+            assert sorted(board[:, i]) == digits
+
+
+def test_count_solutions_stops_at_the_limit():
+    grid = np.zeros(BOARD_SIZE * BOARD_SIZE, dtype=np.int8)
+    rows, cols, blocks = unit_masks(grid)
+    assert count_solutions(grid, rows, cols, blocks, 2) == 2
+    assert count_solutions(grid, rows, cols, blocks, 5) == 5
+    assert not grid.any() and not rows.any() and not cols.any() and not blocks.any()
@@ -3,6 +3,56 @@ import './App.css'
 import SudokuBoard from './components/SudokuBoard'
 import InfoPanel from './components/InfoPanel'
 
+const BOARD_SIZE = 9
+
+// crypto.randomUUID only exists in secure contexts (HTTPS or localhost), getRandomValues works everywhere
+const newSessionId = () => {
+  if (typeof crypto.randomUUID === 'function') {
+    return crypto.randomUUID()
+  }
+  return Array.from(crypto.getRandomValues(new Uint8Array(16)), byte => byte.toString(16).padStart(2, '0')).join('')
+}
+
+// Each browser keeps its own board on the backend, identified by this session id
+const getSessionId = () => {
+  let sessionId = localStorage.getItem('sessionId')
+  if (!sessionId) {
+    sessionId = newSessionId()
+    localStorage.setItem('sessionId', sessionId)
+  }
+  return sessionId
+}
+
+const SESSION_HEADERS = { 'X-Session-Id': getSessionId() }
+
+// Rebuild a cell from its fixed value and candidate bitmask (bit d is set if d is possible)
+const decodeCell = (value, mask) => {
+  if (value) {
+    return { value }
+  }
+  const digits = []
+  for (let digit = 1; digit <= BOARD_SIZE; digit++) {
+    if (mask & (1 << digit)) {
+      digits.push(digit)
+    }
+  }
+  // Every candidate is equally likely
+  const probability = digits.length ? Math.round(10000 / digits.length) / 100 : 0
+  const possibilities = {}
+  digits.forEach(digit => {
+    possibilities[digit] = probability
+  })
+  return { possibilities }
+}
+
+// Turn the flat {f, m} board sent by the backend into a 9x9 grid of cells
+const decodeBoard = ({ f, m }) =>
+  Array.from({ length: BOARD_SIZE }, (_, row) =>
+    Array.from({ length: BOARD_SIZE }, (_, col) =>
+      decodeCell(f[row * BOARD_SIZE + col], m[row * BOARD_SIZE + col])
+    )
+  )
+
 function App() {
   const [board, setBoard] = useState(null)
   const [selectedCell, setSelectedCell] = useState(null)
@@ -18,9 +68,11 @@ function App() {
   const fetchBoard = async () => {
     try {
       setLoading(true)
-      const response = await fetch('http://localhost:8000/board')
+      const response = await fetch('http://localhost:8000/board', {
+        headers: SESSION_HEADERS,
+      })
       const data = await response.json()
-      setBoard(data)
+      setBoard(decodeBoard(data))
       setMessage('Board loaded. Click on a cell to start playing!')
     } catch (error) {
       setMessage('Error loading board: ' + error.message)
@@ -35,6 +87,7 @@ function App() {
       setLoading(true)
       const response = await fetch(`http://localhost:8000/reset?difficulty=${newDifficulty}`, {
         method: 'POST',
+        headers: SESSION_HEADERS,
       })
       const data = await response.json()
       if (data.success) {
@@ -56,6 +109,7 @@ function App() {
       const response = await fetch('http://localhost:8000/assign', {
         method: 'POST',
         headers: {
+          ...SESSION_HEADERS,
           'Content-Type': 'application/json',
         },
         body: JSON.stringify({
@@ -66,7 +120,16 @@ function App() {
       })
       const data = await response.json()
       if (data.success) {
-        setBoard(data.board)
+        // Only the changed cells are sent back, patch them into the current board
+        setBoard(prevBoard => {
+          const nextBoard = prevBoard.map(boardRow => boardRow.slice())
+          data.delta.i.forEach((index, k) => {
+            const row = Math.floor(index / BOARD_SIZE)
+            const col = index % BOARD_SIZE
+            nextBoard[row][col] = decodeCell(data.delta.f[k], data.delta.m[k])
+          })
+          return nextBoard
+        })
         setMessage(data.message)
       } else {
         setMessage('Error assigning values: ' + data.detail)